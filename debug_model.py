@@ -21,28 +21,48 @@ Usage
 
 Requirements
 ------------
-    pip install numpy pillow tensorflow
+    pip install numpy pillow-simd tensorflow
     — or —
-    pip install numpy pillow tflite-runtime
+    pip install numpy pillow-simd tflite-runtime
+
+    pillow-simd is a drop-in Pillow replacement with SSE4/AVX2 resampling,
+    which speeds up the BILINEAR resizes below. Stock pillow also works.
 """
 
+import os
 import sys
+import queue
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 # ── TFLite loader ────────────────────────────────────────────────────────────
+# Interpreters run multi-threaded on all cores. Recent TF / tflite-runtime
+# builds apply the XNNPACK delegate to float32 graphs by default; older
+# tflite-runtime wheels need it loaded explicitly, which is attempted below.
+# int8/uint8 graphs fall back to the built-in (still threaded) kernels when
+# the XNNPACK build lacks quantized operator support.
+_NUM_THREADS = os.cpu_count() or 1
+
 try:
     import tensorflow as tf
-    def _make_interpreter(model_path: str):
-        interp = tf.lite.Interpreter(model_path=model_path)
+    def _make_interpreter(model_path: str, num_threads: int = _NUM_THREADS):
+        interp = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
         interp.allocate_tensors()
         return interp
     _backend = "TensorFlow"
 except ImportError:
     try:
         import tflite_runtime.interpreter as tflite
-        def _make_interpreter(model_path: str):
-            interp = tflite.Interpreter(model_path=model_path)
+        def _make_interpreter(model_path: str, num_threads: int = _NUM_THREADS):
+            try:
+                delegates = [tflite.load_delegate("libXNNPACK.so",
+                                                  {"num_threads": str(num_threads)})]
+            except (ValueError, OSError):
+                delegates = []  # built-in XNNPACK (default-on) or reference kernels
+            interp = tflite.Interpreter(model_path=model_path,
+                                        num_threads=num_threads,
+                                        experimental_delegates=delegates)
             interp.allocate_tensors()
             return interp
         _backend = "tflite-runtime"
@@ -55,32 +75,92 @@ except ImportError:
         )
 
 try:
+    import PIL
     from PIL import Image
 except ImportError:
-    sys.exit("ERROR: Install Pillow: pip install pillow")
+    sys.exit("ERROR: Install Pillow: pip install pillow-simd  (or: pip install pillow)")
+
+# Pillow-SIMD releases carry a ".postN" version suffix; stock Pillow does not.
+_pil_simd = ".post" in PIL.__version__
 
 # ── Paths ────────────────────────────────────────────────────────────────────
 MODEL_PATH  = "assets/models/pig_weight_estimation.tflite"
 LABELS_PATH = "assets/labels/pig_weight_labels.txt"
 
+# ── Resampling ───────────────────────────────────────────────────────────────
+# Large phone photos are box-reduced by integer factors to within 2× of the
+# target before the bilinear pass, which then touches far fewer pixels.
+BILINEAR     = Image.Resampling.BILINEAR
+REDUCING_GAP = 2.0
+
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 def load_labels() -> list[str]:
-    with open(LABELS_PATH) as f:
-        return [line.strip() for line in f if line.strip()]
+    with open(LABELS_PATH, encoding="utf-8-sig") as f:   # file starts with a BOM
+        return [s.strip() for s in f.read().splitlines() if s.strip()]
 
 
 def softmax(logits: np.ndarray) -> np.ndarray:
-    e = np.exp(logits - logits.max())
-    return e / e.sum()
+    e = logits.astype(np.float32)   # one copy, then everything in place
+    e -= e.max()
+    np.exp(e, out=e)
+    e /= e.sum()
+    return e
 
 
-def run_inference(interp, input_data: np.ndarray) -> np.ndarray:
-    in_det  = interp.get_input_details()[0]
-    out_det = interp.get_output_details()[0]
-    interp.set_tensor(in_det["index"], input_data)
+# interp.tensor(idx)() is a zero-copy view of the interpreter's own buffer.
+# Writing into / copying out of it in one expression avoids the extra copy
+# made by set_tensor/get_tensor; the view must not outlive the statement,
+# since invoke() refuses to run while such views are alive and overwrites
+# the output buffer on every call (hence the .copy()).
+
+def run_inference(interp, in_idx: int, out_idx: int, input_data: np.ndarray) -> np.ndarray:
+    interp.tensor(in_idx)()[:] = input_data
     interp.invoke()
-    return interp.get_tensor(out_det["index"])[0]
+    return interp.tensor(out_idx)()[0].copy()
+
+
+def run_batch(interp, in_idx: int, out_idx: int, batch: np.ndarray) -> np.ndarray:
+    """Run every row of `batch` through a single invoke(); returns [N, classes].
+
+    Resizes the input tensor to batch.shape, so it raises on models or
+    delegates that only support a static batch dimension — including graphs
+    that accept the resize but return fewer than N output rows.
+    """
+    interp.resize_tensor_input(in_idx, batch.shape)
+    interp.allocate_tensors()
+    interp.tensor(in_idx)()[:] = batch
+    interp.invoke()
+    out = interp.tensor(out_idx)().copy()
+    if out.shape[0] != len(batch):
+        raise ValueError(f"output has {out.shape[0]} rows for a batch of {len(batch)}")
+    return out
+
+
+def run_parallel(model_path: str, in_idx: int, out_idx: int,
+                 batch: np.ndarray) -> list[np.ndarray | Exception]:
+    """Run each row of `batch` on a pool of single-threaded interpreter replicas.
+
+    Fallback for models with a static batch dimension. invoke() releases
+    the GIL, so the replicas run concurrently. A failing row yields its
+    exception in place of the output.
+    """
+    n_workers = min(_NUM_THREADS, len(batch))
+    replicas: queue.Queue = queue.Queue()
+    for _ in range(n_workers):
+        replicas.put(_make_interpreter(model_path, num_threads=1))
+
+    def infer_one(sample: np.ndarray) -> np.ndarray | Exception:
+        interp = replicas.get()
+        try:
+            return run_inference(interp, in_idx, out_idx, sample)
+        except Exception as e:
+            return e
+        finally:
+            replicas.put(interp)
+
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(infer_one, (batch[i:i + 1] for i in range(len(batch)))))  # [1,H,W,3]
 
 
 def print_section(title: str) -> None:
@@ -96,8 +176,10 @@ def main() -> None:
     parser.add_argument("--image", default=None, help="Path to a pig image for testing")
     args = parser.parse_args()
 
-    print(f"\nBackend : {_backend}")
+    print(f"\nBackend : {_backend}  ({_NUM_THREADS} threads)")
     print(f"Model   : {MODEL_PATH}")
+    print(f"Pillow  : {PIL.__version__}"
+          f"{'  (SIMD)' if _pil_simd else '  (stock — pip install pillow-simd for faster resize)'}")
 
     # ── Load model ────────────────────────────────────────────────────────────
     try:
@@ -107,6 +189,7 @@ def main() -> None:
 
     in_det  = interp.get_input_details()[0]
     out_det = interp.get_output_details()[0]
+    in_idx, out_idx = in_det["index"], out_det["index"]
 
     _, H, W, C   = in_det["shape"]
     in_dtype     = in_det["dtype"]
@@ -162,90 +245,172 @@ def main() -> None:
     # ── Load image ────────────────────────────────────────────────────────────
     print_section(f"IMAGE: {args.image}")
     try:
-        img = Image.open(args.image).convert("RGB")
+        img = Image.open(args.image)
+        src_size = img.size
+        # JPEG only (no-op otherwise): let libjpeg decode at a 1/2, 1/4 or 1/8
+        # DCT scale that still stays ≥ 4× the model input on each side.
+        img.draft("RGB", (int(W) * 4, int(H) * 4))
+        img = img.convert("RGB")
     except Exception as e:
         sys.exit(f"ERROR: Could not load image — {e}")
 
-    img_resized = img.resize((W, H), Image.BILINEAR)
-    base = np.array(img_resized, dtype=np.float32)          # [H,W,3] float32 [0,255]
-    print(f"  Original size : {img.size}")
+    # One uint8 buffer per spatial layout, reused by the resize helpers
+    # below. Pixels stay uint8 until variants() gathers them through the
+    # normalization LUTs into the model input batch.
+    buf_st, buf_cc, buf_lb, buf_ss = np.empty((4, H, W, 3), dtype=np.uint8)
+
+    img_resized = img.resize((W, H), BILINEAR, reducing_gap=REDUCING_GAP)
+    base = buf_st
+    base[...] = np.asarray(img_resized, dtype=np.uint8)     # [H,W,3] uint8 [0,255]
+    print(f"  Original size : {src_size}"
+          f"{f'  (decoded at {img.size})' if img.size != src_size else ''}")
     print(f"  Resized to    : {img_resized.size}")
-    print(f"  Pixel [0,0]   : R={base[0,0,0]:.1f}  G={base[0,0,1]:.1f}  B={base[0,0,2]:.1f}")
-    print(f"  Tensor stats  : min={base.min():.1f}  max={base.max():.1f}  mean={base.mean():.2f}")
+    print(f"  Pixel [0,0]   : R={base[0,0,0]}  G={base[0,0,1]}  B={base[0,0,2]}")
+    print(f"  Tensor stats  : min={base.min()}  max={base.max()}  mean={base.mean():.2f}")
 
     # ImageNet channel means and stds (RGB)
     IN_MEAN = np.array([123.68, 116.779, 103.939], dtype=np.float32)
     IN_STD  = np.array([ 58.393,  57.12,   57.375], dtype=np.float32)
 
+    # uint8 → float32 lookup tables. Inputs only take 256 values per channel,
+    # so each normalization is an exact table gather instead of per-pixel math.
+    levels       = np.arange(256, dtype=np.float32)
+    LUT_M1_1     = levels / 127.5 - 1.0                              # (256,)
+    LUT_0_1      = levels / 255.0                                    # (256,)
+    LUT_IMAGENET = (levels - IN_MEAN[:, None]) / IN_STD[:, None]     # (3,256)
+    LUT_RAW      = levels                                            # (256,)
+
+    # Quantized input: fold (v / scale + zero_point) into the tables so the
+    # variants are gathered straight into in_dtype with no float32 image.
+    if in_dtype in (np.uint8, np.int8):
+        q_info = np.iinfo(in_dtype)
+        q_scale, q_zp = (in_scale, in_zp) if in_scale != 0.0 else (1.0, 0)
+
+        def quantize(lut: np.ndarray) -> np.ndarray:
+            q = np.round(lut / q_scale + q_zp)
+            return np.clip(q, q_info.min, q_info.max).astype(in_dtype)
+
+        LUT_RAW      = (levels + q_info.min).astype(in_dtype)   # uint8: as-is, int8: −128
+        LUT_M1_1     = quantize(LUT_M1_1)
+        LUT_0_1      = quantize(LUT_0_1)
+        LUT_IMAGENET = quantize(LUT_IMAGENET)
+
     # ── Resize strategies ──────────────────────────────────────────────────
     # base was already stretch-resized above (the naive approach).
-    # Now produce alternate spatial layouts from the ORIGINAL image.
-
-    orig_w, orig_h = img.size  # PIL: (width, height)
-
-    def center_crop_resize(pil_img, size: int) -> np.ndarray:
-        """Crop the largest centre square, then resize to size×size."""
+    # Now produce alternate spatial layouts from the full decoded image
+    # (reduced by draft() for large JPEGs), not the stretched base.
+
+    dec_w, dec_h = img.size  # decoded size (after draft), PIL: (width, height)
+
+    def _to_uint8(pixels, out: np.ndarray | None) -> np.ndarray:
+        """Return a PIL image or array as uint8 pixels, copied into `out` if given."""
+        arr = np.asarray(pixels, dtype=np.uint8)
+        if out is None:
+            return arr
+        out[...] = arr
+        return out
+
+    def center_crop_resize(pil_img, size: tuple[int, int],
+                           out: np.ndarray | None = None) -> np.ndarray:
+        """Crop the largest centred region with the size (w, h) aspect ratio,
+        then resize to size. For a square size this is the centre square."""
         w, h = pil_img.size
-        s = min(w, h)
-        left = (w - s) // 2
-        top  = (h - s) // 2
-        cropped = pil_img.crop((left, top, left + s, top + s))
-        resized  = cropped.resize((size, size), Image.BILINEAR)
-        return np.array(resized, dtype=np.float32)
-
-    def letterbox_resize(pil_img, size: int, fill: int = 128) -> np.ndarray:
-        """Resize maintaining aspect ratio, pad remainder with fill value."""
+        out_w, out_h = size
+        if w * out_h > h * out_w:
+            crop_w, crop_h = h * out_w // out_h, h
+        else:
+            crop_w, crop_h = w, w * out_h // out_w
+        left = (w - crop_w) // 2
+        top  = (h - crop_h) // 2
+        cropped = pil_img.crop((left, top, left + crop_w, top + crop_h))
+        resized  = cropped.resize(size, BILINEAR, reducing_gap=REDUCING_GAP)
+        return _to_uint8(resized, out)
+
+    def letterbox_resize(pil_img, size: tuple[int, int], fill: int = 128,
+                         out: np.ndarray | None = None) -> np.ndarray:
+        """Resize maintaining aspect ratio to fit size (w, h), pad remainder
+        with fill value."""
         w, h = pil_img.size
-        scale = size / max(w, h)
+        out_w, out_h = size
+        scale = min(out_w / w, out_h / h)
         new_w, new_h = int(w * scale), int(h * scale)
-        resized = pil_img.resize((new_w, new_h), Image.BILINEAR)
-        canvas = Image.new("RGB", (size, size), (fill, fill, fill))
-        paste_x = (size - new_w) // 2
-        paste_y = (size - new_h) // 2
-        canvas.paste(resized, (paste_x, paste_y))
-        return np.array(canvas, dtype=np.float32)
-
-    def short_side_resize_center_crop(pil_img, size: int) -> np.ndarray:
-        """Resize so the SHORT side = size, then center-crop to size×size.
+        resized = pil_img.resize((new_w, new_h), BILINEAR, reducing_gap=REDUCING_GAP)
+        canvas = np.empty((out_h, out_w, 3), dtype=np.uint8) if out is None else out
+        canvas.fill(fill)
+        paste_x = (out_w - new_w) // 2
+        paste_y = (out_h - new_h) // 2
+        canvas[paste_y:paste_y + new_h, paste_x:paste_x + new_w] = np.asarray(resized)
+        return canvas
+
+    def short_side_resize_center_crop(pil_img, size: tuple[int, int],
+                                      out: np.ndarray | None = None) -> np.ndarray:
+        """Resize so the image just covers size (w, h) — for a square size,
+        the SHORT side = size — then center-crop to size.
         This is the standard Keras/TF ImageNet preprocessing pipeline."""
         w, h = pil_img.size
-        if w < h:
-            new_w, new_h = size, int(h * size / w)
+        out_w, out_h = size
+        if w * out_h < h * out_w:
+            new_w, new_h = out_w, int(h * out_w / w)
         else:
-            new_w, new_h = int(w * size / h), size
-        resized = pil_img.resize((new_w, new_h), Image.BILINEAR)
-        left = (new_w - size) // 2
-        top  = (new_h - size) // 2
-        cropped = resized.crop((left, top, left + size, top + size))
-        return np.array(cropped, dtype=np.float32)
-
-    base_cc  = center_crop_resize(img, W)           # centre-crop square
-    base_lb  = letterbox_resize(img, W)              # letterbox (grey pad)
-    base_ss  = short_side_resize_center_crop(img, W) # short-side → centre crop
-    base_bgr = base[:, :, ::-1].copy()               # swap R↔B channels
+            new_w, new_h = int(w * out_h / h), out_h
+        resized = np.asarray(pil_img.resize((new_w, new_h), BILINEAR, reducing_gap=REDUCING_GAP))
+        left = (new_w - out_w) // 2
+        top  = (new_h - out_h) // 2
+        return _to_uint8(resized[top:top + out_h, left:left + out_w], out)
+
+    # The helpers take PIL-style (width, height) and produce [H,W,3] so that
+    # non-square model inputs fill the per-layout buffers exactly.
+    size = (int(W), int(H))
+    base_cc  = center_crop_resize(img, size, out=buf_cc)   # centre-crop
+    base_lb  = letterbox_resize(img, size, out=buf_lb)      # letterbox (grey pad)
+    # An image already at the model's aspect ratio, or a square model whose
+    # input equals the short side, makes short-side resize + crop produce
+    # exactly the centre-crop pixels — reuse them.
+    if dec_w * H == dec_h * W or (W == H and min(dec_w, dec_h) == W):
+        base_ss = base_cc
+    else:
+        base_ss = short_side_resize_center_crop(img, size, out=buf_ss)  # short-side → centre crop
+    base_bgr = base[:, :, ::-1]                      # swap R↔B channels (view;
+                                                     # the LUT gathers materialize it)
 
     print(f"  Resize strategies prepared:")
-    print(f"    stretch     : {img.size} → {W}x{H} (base)")
-    print(f"    center-crop : {orig_w}x{orig_h} → {W}x{H} via {min(orig_w,orig_h)}px square")
-    print(f"    letterbox   : {orig_w}x{orig_h} → {W}x{H} with grey pad")
-    print(f"    short-side  : {orig_w}x{orig_h} → {W}x{H} (Keras ImageNet style)")
-
-    # Each resize strategy × each normalization
-    def variants(arr: np.ndarray, label: str) -> list[tuple[str, np.ndarray]]:
+    print(f"    stretch     : decoded {dec_w}x{dec_h} → {W}x{H} (base)")
+    crop_desc = (f"{min(dec_w,dec_h)}px square" if W == H
+                 else f"largest centred {W}:{H} region")
+    print(f"    center-crop : decoded {dec_w}x{dec_h} → {W}x{H} via {crop_desc}")
+    print(f"    letterbox   : decoded {dec_w}x{dec_h} → {W}x{H} with grey pad")
+    print(f"    short-side  : decoded {dec_w}x{dec_h} → {W}x{H} (Keras ImageNet style)")
+
+    layouts: list[tuple[np.ndarray, str]] = [
+        (base,     "stretch    "),
+        (base_cc,  "center-crop"),
+        (base_lb,  "letterbox  "),
+        (base_ss,  "short-side "),
+        (base_bgr, "stretch BGR"),   # channel-swap sanity check
+    ]
+
+    # Each resize strategy × each normalization, written straight into the
+    # model input batch. arr is uint8; every variant is a single gather from
+    # a LUT that already yields the model's input dtype. (mode="clip" skips
+    # the bounds-check buffer; uint8 indices are always in range.)
+    def variants(arr: np.ndarray, label: str, out: np.ndarray) -> list[str]:
+        np.take(LUT_RAW,  arr, out=out[0], mode="clip")
+        np.take(LUT_M1_1, arr, out=out[1], mode="clip")
+        np.take(LUT_0_1,  arr, out=out[2], mode="clip")
+        for c in range(3):
+            np.take(LUT_IMAGENET[c], arr[..., c], out=out[3, ..., c], mode="clip")
         return [
-            (f"{label} | raw [0,255]",          arr.copy()),
-            (f"{label} | ÷127.5−1  [-1,1]",     arr / 127.5 - 1.0),
-            (f"{label} | ÷255      [0,1]",       arr / 255.0),
-            (f"{label} | ImageNet mean-std",     (arr - IN_MEAN) / IN_STD),
+            f"{label} | raw [0,255]",
+            f"{label} | ÷127.5−1  [-1,1]",
+            f"{label} | ÷255      [0,1]",
+            f"{label} | ImageNet mean-std",
         ]
 
-    strategies: list[tuple[str, np.ndarray]] = (
-        variants(base,     "stretch    ")
-        + variants(base_cc,  "center-crop")
-        + variants(base_lb,  "letterbox  ")
-        + variants(base_ss,  "short-side ")
-        + variants(base_bgr, "stretch BGR")   # channel-swap sanity check
-    )
+    batch = np.empty((len(layouts) * 4, H, W, 3), dtype=LUT_RAW.dtype)  # [N,H,W,3]
+    strategies: list[str] = []
+    for i, (arr, label) in enumerate(layouts):
+        strategies += variants(arr, label, batch[4 * i:4 * i + 4])
+    batch = batch.astype(in_dtype, copy=False)
 
     print_section("PREPROCESSING COMPARISON")
     best_spread   = -999.0
@@ -254,47 +419,84 @@ def main() -> None:
     best_conf     = 0.0
     results       = []
 
-    for name, norm in strategies:
-        batch = norm[np.newaxis].astype(in_dtype)          # [1,H,W,3]
-        try:
-            raw = run_inference(interp, batch)
-        except Exception as e:
-            print(f"\n  [{name}]\n    ERROR: {e}")
+    # Variants that end up as byte-identical input tensors (common once
+    # quantized to uint8/int8) are only run once; row_of maps each strategy
+    # to its unique input. Rows are bucketed by a small strided probe of
+    # their values and confirmed with an exact comparison, so no row is
+    # copied or hashed in full; the batch is only gathered when something
+    # repeats.
+    buckets: dict[bytes, list[int]] = {}
+    row_of: list[int] = []
+    unique_rows: list[int] = []
+    for i, sample in enumerate(batch):
+        probe = sample.reshape(-1)[::1009].tobytes()
+        bucket = buckets.setdefault(probe, [])
+        for u in bucket:
+            if np.array_equal(sample, batch[unique_rows[u]]):
+                break
+        else:
+            u = len(unique_rows)
+            unique_rows.append(i)
+            bucket.append(u)
+        row_of.append(u)
+    if len(unique_rows) == len(batch):
+        unique = batch
+    else:
+        unique = batch[unique_rows]
+        print(f"\n  {len(batch) - len(unique)} duplicate input tensor(s) — reusing their outputs.")
+
+    unique_raws: list[np.ndarray | Exception]
+    try:
+        unique_raws = list(run_batch(interp, in_idx, out_idx, unique))
+    except Exception as e:
+        # Static batch dimension — one invoke per strategy, across cores.
+        print(f"\n  Batched invoke unavailable ({e}); "
+              f"running strategies on {min(_NUM_THREADS, len(unique))} interpreter replicas.")
+        unique_raws = run_parallel(MODEL_PATH, in_idx, out_idx, unique)
+    raws = [unique_raws[u] for u in row_of]
+
+    for name, raw in zip(strategies, raws):
+        if isinstance(raw, Exception):
+            print(f"\n  [{name}]\n    ERROR: {raw}")
             continue
 
-        # Detect whether output is already probabilities
-        already_prob = abs(raw.sum() - 1.0) < 0.01
-        probs = raw if already_prob else softmax(raw)
+        rmax, rmin, rsum, rmean = raw.max(), raw.min(), raw.sum(), raw.mean()
 
-        spread   = float(raw.max() - raw.mean())
-        top_idx  = int(np.argmax(probs))
-        top_lbl  = labels[top_idx] if top_idx < len(labels) else f"idx_{top_idx}"
-        top_conf = float(probs[top_idx]) * 100.0
+        # Detect whether output is already probabilities
+        already_prob = abs(rsum - 1.0) < 0.01
 
-        # Top-3
-        top3 = np.argsort(probs)[-3:][::-1]
+        # softmax is monotonic, so ranking and top-3 work on raw directly;
+        # probabilities are only computed below for the results printed.
+        # Top-3: O(n) partition, then sort just those three (descending)
+        k    = min(3, raw.size)
+        top3 = np.argpartition(raw, -k)[-k:]
+        top3 = top3[np.argsort(raw[top3])[::-1]]   # no negation: raw may be uint8
 
-        results.append((spread, name, top_lbl, top_conf, raw, probs, top3))
+        spread   = float(rmax - rmean)
+        top_idx  = int(top3[0])
+        top_lbl  = labels[top_idx] if top_idx < len(labels) else f"idx_{top_idx}"
 
-        if spread > best_spread:
-            best_spread = spread
-            best_name   = name
-            best_label  = top_lbl
-            best_conf   = top_conf
+        results.append((spread, name, top_lbl, (rmax, rmin, rsum, rmean), raw, already_prob, top3))
 
-    # Print sorted by spread descending
+    # Print sorted by spread descending (stable, so ties keep strategy order)
     results.sort(key=lambda r: r[0], reverse=True)
-    for rank, (spread, name, top_lbl, top_conf, raw, probs, top3) in enumerate(results):
+    for rank, (spread, name, top_lbl, (rmax, rmin, rsum, rmean), raw, already_prob, top3) in enumerate(results):
+        probs    = raw if already_prob else softmax(raw)
+        pct      = probs * 100.0
+        top_conf = float(pct[top3[0]])
+        if rank == 0:
+            best_spread, best_name, best_label, best_conf = spread, name, top_lbl, top_conf
+
         marker = " ◀ BEST" if rank == 0 else ""
         print(f"\n  [{rank+1}] {name}{marker}")
-        print(f"       raw  : max={raw.max():.4f}  min={raw.min():.4f}  "
-              f"sum={raw.sum():.4f}  mean={raw.mean():.4f}")
+        print(f"       raw  : max={rmax:.4f}  min={rmin:.4f}  "
+              f"sum={rsum:.4f}  mean={rmean:.4f}")
         print(f"       spread (max−mean) : {spread:.4f}  "
               f"{'▓'*min(int(spread*4), 40)}")
         print(f"       → {top_lbl} @ {top_conf:.1f}%")
         for i, idx in enumerate(top3):
             lbl = labels[idx] if idx < len(labels) else f"idx_{idx}"
-            print(f"         #{i+1}: {lbl} ({probs[idx]*100:.2f}%)")
+            print(f"         #{i+1}: {lbl} ({pct[idx]:.2f}%)")
 
     # ── Recommendation ────────────────────────────────────────────────────────
     print_section("RECOMMENDATION")